@@ -3,21 +3,22 @@
 
 import functools
 import itertools
-from collections import OrderedDict, defaultdict
+from collections import Counter, OrderedDict, defaultdict
 from functools import reduce
 from typing import Tuple, Union
 
 import opt_einsum
 from multipledispatch.variadic import Variadic
+from opt_einsum.backends.dispatch import get_func
 
 import funsor.ops as ops
 from funsor.affine import affine_inputs
 from funsor.delta import Delta
 from funsor.domains import find_domain
 from funsor.gaussian import Gaussian
-from funsor.interpreter import interpretation, recursion_reinterpret
+from funsor.interpreter import interpretation, memoize_reinterpret, recursion_reinterpret
 from funsor.ops import DISTRIBUTIVE_OPS, AssociativeOp, NullOp, nullop
-from funsor.tensor import Tensor
+from funsor.tensor import BACKEND_TO_EINSUM_BACKEND, Tensor, align_tensors, cached_contract_expression
 from funsor.terms import (
     Align,
     Binary,
@@ -158,12 +159,30 @@ def _(arg, indent, out):
 
 
 @recursion_reinterpret.register(Contraction)
+@memoize_reinterpret
 def recursion_reinterpret_contraction(x):
     return type(x)(*map(recursion_reinterpret, (x.red_op, x.bin_op, x.reduced_vars) + x.terms))
 
 
+_STACKED_BIN_OP_TO_REDUCE = {
+    ops.add: ops.sum,
+    ops.mul: ops.prod,
+    ops.logaddexp: ops.logsumexp,
+}
+
+
 @eager.register(Contraction, AssociativeOp, AssociativeOp, frozenset, Variadic[Funsor])
 def eager_contraction_generic_to_tuple(red_op, bin_op, reduced_vars, *terms):
+    if red_op is nullop and bin_op in _STACKED_BIN_OP_TO_REDUCE and len(terms) > 2 and \
+            all(isinstance(term, Tensor) and term.dtype == "real" for term in terms) and \
+            len(set(term.output for term in terms)) == 1 and \
+            len(set(frozenset(term.inputs) for term in terms)) == 1:
+        # combine many tensors with a single stacked reduction rather than n - 1 binary ops;
+        # this is only done when no term needs to be expanded, since broadcasting
+        # terms pairwise is cheaper than stacking n copies of the full joint shape
+        inputs, tensors = align_tensors(*terms)
+        data = _STACKED_BIN_OP_TO_REDUCE[bin_op](ops.stack(0, *tensors), 0)
+        return Tensor(data, inputs)
     return eager(Contraction, red_op, bin_op, reduced_vars, terms)
 
 
@@ -171,13 +190,15 @@ def eager_contraction_generic_to_tuple(red_op, bin_op, reduced_vars, *terms):
 def eager_contraction_generic_recursive(red_op, bin_op, reduced_vars, terms):
     # push down leaf reductions
     terms, reduced_vars, leaf_reduced = list(terms), frozenset(reduced_vars), False
+    term_vars = [reduced_vars.intersection(v.inputs) for v in terms]
     for i, v in enumerate(terms):
-        unique_vars = reduced_vars.intersection(v.inputs) - \
-            frozenset().union(*(reduced_vars.intersection(vv.inputs) for vv in terms if vv is not v))
+        unique_vars = term_vars[i] - \
+            frozenset().union(*(vv_vars for vv, vv_vars in zip(terms, term_vars) if vv is not v))
         if unique_vars:
             result = v.reduce(red_op, unique_vars)
             if result is not normalize(Contraction, red_op, nullop, unique_vars, (v,)):
                 terms[i] = result
+                term_vars[i] = term_vars[i] - unique_vars
                 reduced_vars -= unique_vars
                 leaf_reduced = True
 
@@ -187,12 +208,12 @@ def eager_contraction_generic_recursive(red_op, bin_op, reduced_vars, terms):
     # exploit associativity to recursively evaluate this contraction
     # a bit expensive, but handles interpreter-imposed directionality constraints
     terms = tuple(terms)
+    var_counts = Counter(k for vars_ in term_vars for k in vars_)
     for i, lhs in enumerate(terms[0:-1]):
         for j_, rhs in enumerate(terms[i+1:]):
             j = i + j_ + 1
-            unique_vars = reduced_vars.intersection(lhs.inputs, rhs.inputs) - \
-                frozenset().union(*(reduced_vars.intersection(vv.inputs)
-                                    for vv in terms[:i] + terms[i+1:j] + terms[j+1:]))
+            # variables shared by lhs and rhs that appear in no other term
+            unique_vars = frozenset(k for k in term_vars[i] & term_vars[j] if var_counts[k] == 2)
             result = Contraction(red_op, bin_op, unique_vars, lhs, rhs)
             if result is not normalize(Contraction, red_op, bin_op, unique_vars, (lhs, rhs)):  # did we make progress?
                 # pick the first evaluable pair
@@ -205,6 +226,8 @@ def eager_contraction_generic_recursive(red_op, bin_op, reduced_vars, terms):
 
 @eager.register(Contraction, AssociativeOp, AssociativeOp, frozenset, Funsor)
 def eager_contraction_to_reduce(red_op, bin_op, reduced_vars, term):
+    if not reduced_vars:
+        return term
     args = red_op, term, reduced_vars
     return eager.dispatch(Reduce, *args)(*args)
 
@@ -242,21 +265,77 @@ def eager_contraction_tensor(red_op, bin_op, reduced_vars, *terms):
     return _eager_contract_tensors(reduced_vars, terms, backend=backend)
 
 
-# TODO Consider using this for more than binary contractions.
-def _eager_contract_tensors(reduced_vars, terms, backend):
+@functools.lru_cache(maxsize=1024)
+def _matmul_plan(lhs, rhs, out):
+    """
+    Plans a pairwise einsum ``lhs,rhs->out`` as a single batched matmul, or
+    returns None if some variable is reduced out of only one operand.
+    """
+    if any(s not in out and s not in rhs for s in lhs) or any(s not in out and s not in lhs for s in rhs):
+        return None
+    batch = tuple(s for s in out if s in lhs and s in rhs)
+    left = tuple(s for s in out if s in lhs and s not in rhs)
+    right = tuple(s for s in out if s in rhs and s not in lhs)
+    contract = tuple(s for s in lhs if s in rhs and s not in out)
+    lhs_perm = tuple(lhs.index(s) for s in batch + left + contract)
+    rhs_perm = tuple(rhs.index(s) for s in batch + contract + right)
+    result = batch + left + right
+    out_perm = tuple(result.index(s) for s in out)
+    return lhs_perm, rhs_perm, out_perm, len(batch), len(left), len(right)
+
+
+def _matmul_contract(plan, lhs, rhs):
+    lhs_perm, rhs_perm, out_perm, num_batch, num_left, num_right = plan
+    lhs = ops.permute(lhs, lhs_perm)
+    rhs = ops.permute(rhs, rhs_perm)
+    batch_shape = tuple(lhs.shape[:num_batch])
+    left_shape = tuple(lhs.shape[num_batch:num_batch + num_left])
+    right_shape = tuple(rhs.shape[len(rhs.shape) - num_right:])
+    left_size = reduce(ops.mul, left_shape, 1)
+    right_size = reduce(ops.mul, right_shape, 1)
+    contract_size = reduce(ops.mul, lhs.shape[num_batch + num_left:], 1)
+    lhs = lhs.reshape(batch_shape + (left_size, contract_size))
+    rhs = rhs.reshape(batch_shape + (contract_size, right_size))
+    data = (lhs @ rhs).reshape(batch_shape + left_shape + right_shape)
+    return ops.permute(data, out_perm)
+
+
+@functools.lru_cache(maxsize=1024)
+def _einsum_plan(term_inputs, term_shapes, reduced_vars):
+    """
+    Computes the einsum subscripts and output inputs of a tensor contraction,
+    which depend only on the inputs and shapes of terms, not on their data.
+    """
     iter_symbols = map(opt_einsum.get_symbol, itertools.count())
     symbols = defaultdict(functools.partial(next, iter_symbols))
 
     inputs = OrderedDict()
     einsum_inputs = []
-    operands = []
-    for term in terms:
-        inputs.update(term.inputs)
-        einsum_inputs.append("".join(symbols[k] for k in term.inputs) +
-                             "".join(symbols[i - len(term.shape)]
-                                     for i, size in enumerate(term.shape)
+    for term_input, term_shape in zip(term_inputs, term_shapes):
+        inputs.update((k, d) for k, d in term_input if k not in reduced_vars)
+        einsum_inputs.append("".join(symbols[k] for k, d in term_input) +
+                             "".join(symbols[i - len(term_shape)]
+                                     for i, size in enumerate(term_shape)
                                      if size != 1))
 
+    event_shape = broadcast_shape(*term_shapes)
+    einsum_output = ("".join(symbols[k] for k in inputs) +
+                     "".join(symbols[dim]
+                             for dim in range(-len(event_shape), 0)
+                             if dim in symbols))
+    return tuple(inputs.items()), tuple(einsum_inputs), einsum_output, len(symbols)
+
+
+# TODO Consider using this for more than binary contractions.
+def _eager_contract_tensors(reduced_vars, terms, backend):
+    inputs, einsum_inputs, einsum_output, num_symbols = _einsum_plan(
+        tuple(tuple(term.inputs.items()) for term in terms),
+        tuple(term.shape for term in terms),
+        reduced_vars)
+    inputs = OrderedDict(inputs)
+
+    operands = []
+    for term in terms:
         # Squeeze absent event dims to be compatible with einsum.
         data = term.data
         batch_shape = data.shape[:len(data.shape) - len(term.shape)]
@@ -264,16 +343,28 @@ def _eager_contract_tensors(reduced_vars, terms, backend):
         data = data.reshape(batch_shape + event_shape)
         operands.append(data)
 
-    for k in reduced_vars:
-        del inputs[k]
     batch_shape = tuple(v.size for v in inputs.values())
     event_shape = broadcast_shape(*(term.shape for term in terms))
-    einsum_output = ("".join(symbols[k] for k in inputs) +
-                     "".join(symbols[dim]
-                             for dim in range(-len(event_shape), 0)
-                             if dim in symbols))
     equation = ",".join(einsum_inputs) + "->" + einsum_output
-    data = opt_einsum.contract(equation, *operands, backend=backend)
+    plan = None
+    if len(operands) == 2 and backend in _EINSUM_BACKENDS:
+        plan = _matmul_plan(einsum_inputs[0], einsum_inputs[1], einsum_output)
+    if plan is not None:
+        # Pairwise contractions have a trivial path, so bypass opt_einsum
+        # and contract with a single batched matmul.
+        data = _matmul_contract(plan, *operands)
+    elif len(operands) == 2 and backend in _EINSUM_BACKENDS and num_symbols <= 26:
+        # NB: the first 26 opt_einsum symbols are a-z, which all backends accept.
+        data = ops.einsum(equation, *operands)
+    elif len(operands) == 2 and backend in _LOGSUMEXP_BACKENDS and num_symbols <= 26:
+        # Contract in log space by shifting each operand by its max over
+        # contracted dims, so exp(lhs + rhs) is never materialized.
+        # NB: funsor.einsum imports this module, so the kernel is resolved through
+        # opt_einsum's function cache rather than imported at module scope.
+        data = get_func("einsum", "funsor.einsum.numpy_log")(equation, *operands)
+    else:
+        shapes = tuple(tuple(x.shape) for x in operands)
+        data = cached_contract_expression(equation, *shapes)(*operands, backend=backend)
     data = data.reshape(batch_shape + event_shape)
     return Tensor(data, inputs)
 
@@ -340,6 +431,9 @@ def normalize_trivial(red_op, bin_op, reduced_vars, term):
 @normalize.register(Contraction, AssociativeOp, AssociativeOp, frozenset, tuple)
 def normalize_contraction_generic_tuple(red_op, bin_op, reduced_vars, terms):
 
+    if len(terms) == 1 and not reduced_vars:
+        return terms[0]
+
     if not reduced_vars and red_op is not nullop:
         return Contraction(nullop, bin_op, reduced_vars, *terms)
 
@@ -359,14 +453,25 @@ def normalize_contraction_generic_tuple(red_op, bin_op, reduced_vars, terms):
             new_terms = (terms[0],)
         return Contraction(red_op, bin_op, reduced_vars, *new_terms)
 
+    # fuse nested products of the same bin_op in a single pass, however deep
+    if bin_op is not nullop and any(isinstance(v, Contraction) and v.red_op is nullop and v.bin_op is bin_op
+                                    for v in terms):
+        new_terms, stack = [], list(reversed(terms))
+        while stack:
+            v = stack.pop()
+            if isinstance(v, Contraction) and v.red_op is nullop and v.bin_op is bin_op:
+                stack.extend(reversed(v.terms))
+            else:
+                new_terms.append(v)
+        return Contraction(red_op, bin_op, reduced_vars, *new_terms)
+
     for i, v in enumerate(terms):
 
         if not isinstance(v, Contraction):
             continue
 
         # fuse operations without distributing
-        if (v.red_op is nullop and bin_op is v.bin_op) or \
-                (bin_op is nullop and v.red_op in (red_op, nullop)):
+        if bin_op is nullop and v.red_op in (red_op, nullop):
             red_op = v.red_op if red_op is nullop else red_op
             bin_op = v.bin_op if bin_op is nullop else bin_op
             new_terms = terms[:i] + v.terms + terms[i+1:]
@@ -449,11 +554,7 @@ def unary_contract(op, arg):
     return Contraction(arg.red_op, arg.bin_op, arg.reduced_vars, *(op(t) for t in arg.terms))
 
 
-BACKEND_TO_EINSUM_BACKEND = {
-    "numpy": "numpy",
-    "torch": "torch",
-    "jax": "jax.numpy",
-}
+_EINSUM_BACKENDS = frozenset(BACKEND_TO_EINSUM_BACKEND.values())
 # NB: numpy_log, numpy_map is backend-agnostic so they also work for torch backend;
 # however, we might need to profile to make a switch
 BACKEND_TO_LOGSUMEXP_BACKEND = {
@@ -461,6 +562,7 @@ BACKEND_TO_LOGSUMEXP_BACKEND = {
     "torch": "pyro.ops.einsum.torch_log",
     "jax": "funsor.einsum.numpy_log",
 }
+_LOGSUMEXP_BACKENDS = frozenset(BACKEND_TO_LOGSUMEXP_BACKEND.values())
 BACKEND_TO_MAP_BACKEND = {
     "numpy": "funsor.einsum.numpy_map",
     "torch": "pyro.ops.einsum.torch_map",
@@ -1,6 +1,7 @@
 # Copyright Contributors to the Pyro project.
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import operator
 from collections import namedtuple
 from functools import reduce
@@ -75,9 +76,12 @@ def bint(size):
     return Domain((), size)
 
 
+@functools.lru_cache(maxsize=4096)
 def find_domain(op, *domains):
     r"""
     Finds the :class:`Domain` resulting when applying ``op`` to ``domains``.
+    Results are cached, since the same few ``(op, domains)`` combinations
+    recur on every eager binary and unary operation.
     :param callable op: An operation.
     :param Domain \*domains: One or more input domains.
     """
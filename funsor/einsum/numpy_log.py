@@ -41,7 +41,10 @@ def einsum(equation, *operands):
             shift = ops.permute(shift, [dims.index(dim) for dim in output])
         shifts.append(shift)
 
-    result = ops.log(ops.einsum(equation, *exp_operands))
+    result = ops.einsum(equation, *exp_operands)
+    # avoid nan gradients due to log(0) at outputs that are -inf
+    zero = result == 0
+    result = ops.log(result + zero) + ops.log(~zero)
     return sum(shifts + [result])
 
 
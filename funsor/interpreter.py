@@ -6,7 +6,7 @@ import inspect
 import os
 import re
 import types
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict, deque
 from contextlib import contextmanager
 from functools import singledispatch
 
@@ -25,6 +25,7 @@ _INTERPRETATION = None  # To be set later in funsor.terms
 _USE_TCO = int(os.environ.get("FUNSOR_USE_TCO", 0))
 
 _GENSYM_COUNTER = 0
+_REINTERPRET_CACHES = []  # a stack of caches, one per active call to reinterpret()
 
 
 def _indent():
@@ -136,8 +137,29 @@ def recursion_reinterpret(x):
     raise ValueError(type(x))
 
 
+def memoize_reinterpret(fn):
+    """
+    Decorator to share results of :func:`recursion_reinterpret` among repeated
+    subexpressions of the expression passed to :func:`reinterpret`, so that
+    each node of a DAG is reinterpreted only once per call.
+    """
+    @functools.wraps(fn)
+    def wrapped(x):
+        if not _REINTERPRET_CACHES:
+            return fn(x)
+        cache = _REINTERPRET_CACHES[-1]
+        key = id(x), _INTERPRETATION
+        if key in cache:
+            return cache[key][1]
+        result = fn(x)
+        cache[key] = x, result  # keep x alive so that its id is not reused
+        return result
+    return wrapped
+
+
 # We need to register this later in terms.py after declaring Funsor.
 # reinterpret.register(Funsor)
+@memoize_reinterpret
 @debug_logged
 def reinterpret_funsor(x):
     return _INTERPRETATION(type(x), *map(recursion_reinterpret, x._ast_values))
@@ -252,12 +274,12 @@ def stack_reinterpret(x):
     node_vars = {x_name: x}
     node_names = {x: x_name}
     env = {}
-    stack = [(x_name, x)]
+    stack = deque([(x_name, x)])
     parent_to_children = OrderedDict()
-    child_to_parents = OrderedDict()
+    child_to_parents = defaultdict(list)
     while stack:
-        h_name, h = stack.pop(0)
-        parent_to_children[h_name] = []
+        h_name, h = stack.popleft()
+        h_children = parent_to_children[h_name] = []
         for c in children(h):
             if c in node_names:
                 c_name = node_names[c]
@@ -266,13 +288,13 @@ def stack_reinterpret(x):
                 node_names[c] = c_name
                 node_vars[c_name] = c
                 stack.append((c_name, c))
-            parent_to_children.setdefault(h_name, []).append(c_name)
-            child_to_parents.setdefault(c_name, []).append(h_name)
+            h_children.append(c_name)
+            child_to_parents[c_name].append(h_name)
 
     children_counts = OrderedDict((k, len(v)) for k, v in parent_to_children.items())
-    leaves = [name for name, count in children_counts.items() if count == 0]
+    leaves = deque(name for name, count in children_counts.items() if count == 0)
     while leaves:
-        h_name = leaves.pop(0)
+        h_name = leaves.popleft()
         if h_name in child_to_parents:
             for parent in child_to_parents[h_name]:
                 children_counts[parent] -= 1
@@ -282,12 +304,12 @@ def stack_reinterpret(x):
         h = node_vars[h_name]
         if is_atom(h):
             env[h_name] = h
-        elif isinstance(h, (tuple, frozenset)):
-            env[h_name] = type(h)(
-                env[c_name] for c_name in parent_to_children[h_name])
+            continue
+        h_args = [env[c_name] for c_name in parent_to_children[h_name]]
+        if isinstance(h, (tuple, frozenset)):
+            env[h_name] = type(h)(h_args)
         else:
-            env[h_name] = _INTERPRETATION(
-                type(h), *(env[c_name] for c_name in parent_to_children[h_name]))
+            env[h_name] = _INTERPRETATION(type(h), *h_args)
 
     return env[x_name]
 
@@ -307,8 +329,12 @@ def reinterpret(x):
     """
     if _USE_TCO:
         return stack_reinterpret(x)
-    else:
+
+    _REINTERPRET_CACHES.append({})
+    try:
         return recursion_reinterpret(x)
+    finally:
+        _REINTERPRET_CACHES.pop()
 
 
 def dispatched_interpretation(fn):
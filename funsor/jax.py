@@ -153,7 +153,7 @@ def _log(x):
     return np.log(x)
 
 
-@ops.logsumexp.register(array, (int, type(None)))
+@ops.logsumexp.register(array, (int, tuple, type(None)))
 def _logsumexp(x, dim):
     return logsumexp(x, axis=dim)
 
@@ -93,7 +93,6 @@ def moment_matching_contract_joint(red_op, bin_op, reduced_vars, discrete, gauss
     if approx_vars and not exact_vars:
         discrete += gaussian.log_normalizer
         new_discrete = discrete.reduce(ops.logaddexp, approx_vars.intersection(discrete.inputs))
-        new_discrete = discrete.reduce(ops.logaddexp, approx_vars.intersection(discrete.inputs))
         num_elements = reduce(ops.mul, [
             gaussian.inputs[k].num_elements for k in approx_vars.difference(discrete.inputs)], 1)
         if num_elements != 1:
@@ -102,25 +101,37 @@ def moment_matching_contract_joint(red_op, bin_op, reduced_vars, discrete, gauss
         int_inputs = OrderedDict((k, d) for k, d in gaussian.inputs.items() if d.dtype != 'real')
         probs = (discrete - new_discrete.clamp_finite()).exp()
 
+        # Flatten approx_vars into a single trailing dim K, so that each moment
+        # is computed by a single einsum that streams probs once.
+        batch_inputs = OrderedDict((k, d) for k, d in probs.inputs.items() if k not in approx_vars)
+        batch_inputs.update((k, d) for k, d in int_inputs.items() if k not in approx_vars)
+        batch_shape = tuple(d.dtype for d in batch_inputs.values())
+        flat_inputs = batch_inputs.copy()
+        flat_inputs.update((k, d) for k, d in int_inputs.items() if k in approx_vars)
+        dim = gaussian.info_vec.shape[-1]
+
+        probs = align_tensor(flat_inputs, probs, expand=True).reshape(batch_shape + (-1,))
         old_loc = Tensor(ops.cholesky_solve(ops.unsqueeze(gaussian.info_vec, -1), gaussian._precision_chol).squeeze(-1),
                          int_inputs)
-        new_loc = (probs * old_loc).reduce(ops.add, approx_vars)
+        old_loc = align_tensor(flat_inputs, old_loc, expand=True).reshape(batch_shape + (-1, dim))
         old_cov = Tensor(ops.cholesky_inverse(gaussian._precision_chol), int_inputs)
-        diff = old_loc - new_loc
-        outers = Tensor(ops.unsqueeze(diff.data, -1) * ops.unsqueeze(diff.data, -2), diff.inputs)
-        new_cov = ((probs * old_cov).reduce(ops.add, approx_vars) +
-                   (probs * outers).reduce(ops.add, approx_vars))
+        old_cov = align_tensor(flat_inputs, old_cov, expand=True).reshape(batch_shape + (-1, dim, dim))
+
+        new_loc = ops.einsum("...k,...ki->...i", probs, old_loc)
+        diff = old_loc - ops.unsqueeze(new_loc, -2)
+        new_cov = (ops.einsum("...k,...kij->...ij", probs, old_cov) +
+                   ops.einsum("...k,...ki,...kj->...ij", probs, diff, diff))
 
         # Numerically stabilize by adding bogus precision to empty components.
-        total = probs.reduce(ops.add, approx_vars)
-        mask = ops.unsqueeze(ops.unsqueeze((total.data == 0), -1), -1)
-        new_cov.data = new_cov.data + mask * ops.new_eye(new_cov.data, new_cov.data.shape[-1:])
+        total = ops.sum(probs, -1)
+        mask = ops.unsqueeze(ops.unsqueeze((total == 0), -1), -1)
+        new_cov = new_cov + mask * ops.new_eye(new_cov, new_cov.shape[-1:])
 
-        new_precision = Tensor(ops.cholesky_inverse(ops.cholesky(new_cov.data)), new_cov.inputs)
-        new_info_vec = (new_precision.data @ ops.unsqueeze(new_loc.data, -1)).squeeze(-1)
-        new_inputs = new_loc.inputs.copy()
+        new_precision = ops.cholesky_inverse(ops.cholesky(new_cov))
+        new_info_vec = (new_precision @ ops.unsqueeze(new_loc, -1)).squeeze(-1)
+        new_inputs = batch_inputs.copy()
         new_inputs.update((k, d) for k, d in gaussian.inputs.items() if d.dtype == 'real')
-        new_gaussian = Gaussian(new_info_vec, new_precision.data, new_inputs)
+        new_gaussian = Gaussian(new_info_vec, new_precision, new_inputs)
         new_discrete -= new_gaussian.log_normalizer
 
         return new_discrete + new_gaussian
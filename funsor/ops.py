@@ -414,6 +414,16 @@ def logsumexp(x, dim):
     return log(np.sum(np.exp(x - amax), axis=dim)) + amax.squeeze(axis=dim)
 
 
+@logaddexp.register(array, array)
+@logaddexp.register((int, float), array)
+@logaddexp.register(array, (int, float))
+@sample.register(array, array)
+@sample.register((int, float), array)
+@sample.register(array, (int, float))
+def _logaddexp(x, y):
+    return np.logaddexp(x, y)
+
+
 @max.register(array, array)
 def _max(x, y):
     return np.maximum(x, y)
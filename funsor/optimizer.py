@@ -1,10 +1,11 @@
 # Copyright Contributors to the Pyro project.
 # SPDX-License-Identifier: Apache-2.0
 
-import collections
+from functools import reduce
+from operator import mul, or_
 
 from multipledispatch.variadic import Variadic
-from opt_einsum.paths import greedy
+from opt_einsum.paths import ssa_greedy_optimize
 
 import funsor.interpreter as interpreter
 from funsor.cnf import Contraction, nullop
@@ -66,6 +67,72 @@ def optimize(cls, *args):
 REAL_SIZE = 3  # the "size" of a real-valued dimension passed to the path optimizer
 
 
+def _input_size(domain):
+    """
+    Returns the extent of an input of a given domain, as seen by the path optimizer.
+    Discrete inputs of nonempty shape range over ``dtype ** num_elements`` values.
+    """
+    if domain.dtype == 'real':
+        return REAL_SIZE * domain.num_elements
+    return domain.dtype ** domain.num_elements
+
+
+def _vars_size(input_vars, size_dict):
+    return reduce(mul, (size_dict[var] for var in input_vars), 1)
+
+
+def _pair_cost(lhs_vars, rhs_vars, result_vars, size_dict):
+    return _vars_size(result_vars, size_dict) - (_vars_size(lhs_vars, size_dict) +
+                                                 _vars_size(rhs_vars, size_dict))
+
+
+def _replay_path(input_masks, path, reduce_mask):
+    """
+    Schedules reductions along a contraction path, reducing each variable as
+    soon as it has been removed from all remaining terms.
+
+    :param list input_masks: A list of bitmasks of the variables of each term.
+    :param list path: A contraction path in static single assignment form.
+    :param int reduce_mask: A bitmask of the variables to reduce.
+    :return: A pair ``(step_reduce_masks, final_reduce_mask)`` of bitmasks of
+        the variables to reduce at each step of the path, and of the variables
+        that remain to be reduced after the last step.
+    :rtype: tuple
+    """
+    reduced_bits = [i for i in range(reduce_mask.bit_length()) if reduce_mask >> i & 1]
+
+    # first prepare a reduce_dim counter to avoid early reduction
+    reduce_dim_counter = [0] * reduce_mask.bit_length()
+    for mask in input_masks:
+        for i in reduced_bits:
+            reduce_dim_counter[i] += mask >> i & 1
+
+    masks = list(input_masks)
+    step_reduce_masks = []
+    for (a, b) in path:
+        a_mask, b_mask = masks[a], masks[b]
+
+        # don't reduce a dimension too early - only reduce when the dimension
+        # is removed from all lhs terms in path, otherwise count its new appearance
+        both_mask = a_mask | b_mask
+        step_reduce_mask = 0
+        for i in reduced_bits:
+            reduce_dim_counter[i] -= (a_mask >> i & 1) + (b_mask >> i & 1)
+            if both_mask >> i & 1:
+                if reduce_dim_counter[i] == 0:
+                    step_reduce_mask |= 1 << i
+                else:
+                    reduce_dim_counter[i] += 1
+        step_reduce_masks.append(step_reduce_mask)
+        masks.append(both_mask & ~step_reduce_mask)
+
+    final_reduce_mask = 0
+    for i in reduced_bits:
+        if reduce_dim_counter[i] > 0:
+            final_reduce_mask |= 1 << i
+    return step_reduce_masks, final_reduce_mask
+
+
 optimize.register(Contraction, AssociativeOp, AssociativeOp, frozenset, Variadic[Funsor])(
     lambda r, b, v, *ts: optimize(Contraction, r, b, v, tuple(ts)))
 
@@ -82,46 +149,52 @@ def optimize_contract_finitary_funsor(red_op, bin_op, reduced_vars, terms):
     if red_op is nullop or bin_op is nullop or not (red_op, bin_op) in DISTRIBUTIVE_OPS:
         return None
 
+    # a pairwise contraction has only one possible path
+    if len(terms) <= 2:
+        return None
+
     # build opt_einsum optimizer IR
     inputs = [frozenset(term.inputs) for term in terms]
-    size_dict = {k: ((REAL_SIZE * v.num_elements) if v.dtype == 'real' else v.dtype)
-                 for term in terms for k, v in term.inputs.items()}
+    size_dict = {}
+    for term in terms:
+        for k, v in term.inputs.items():
+            if k not in size_dict:
+                size_dict[k] = _input_size(v)
     outputs = frozenset().union(*inputs) - reduced_vars
 
-    # optimize path with greedy opt_einsum optimizer
-    # TODO switch to new 'auto' strategy
-    path = greedy(inputs, outputs, size_dict)
-
-    # first prepare a reduce_dim counter to avoid early reduction
-    reduce_dim_counter = collections.Counter()
-    for input in inputs:
-        reduce_dim_counter.update({d: 1 for d in input})
-
+    if len(inputs) == 3:
+        # there are only three possible paths, so pick the cheapest first pair directly
+        def cost(i, j):
+            k = 3 - i - j
+            return _pair_cost(inputs[i], inputs[j], (inputs[i] | inputs[j]) & (outputs | inputs[k]), size_dict)
+
+        i, j = min(((0, 1), (0, 2), (1, 2)), key=lambda ij: cost(*ij))
+        path = [(i, j), (3 - i - j, 3)]
+    else:
+        # optimize path with greedy opt_einsum optimizer
+        # TODO switch to new 'auto' strategy
+        path = ssa_greedy_optimize(inputs, outputs, size_dict)
+
+    # assign a bit to each variable, so that set operations become integer operations
+    var_bits = {k: 1 << i for i, k in enumerate(size_dict)}
+    masks = [reduce(or_, (var_bits[k] for k in input), 0) for input in inputs]
+    reduce_mask = reduce(or_, (var_bits[k] for k in reduced_vars if k in var_bits), 0)
+    step_reduce_masks, final_reduce_mask = _replay_path(masks, path, reduce_mask)
+
+    # replay the path using static single assignment ids, i.e. consumed
+    # operands are set to None and each intermediate result is appended
     operands = list(terms)
-    for (a, b) in path:
-        b, a = tuple(sorted((a, b), reverse=True))
-        tb = operands.pop(b)
-        ta = operands.pop(a)
-
-        # don't reduce a dimension too early - keep a collections.Counter
-        # and only reduce when the dimension is removed from all lhs terms in path
-        reduce_dim_counter.subtract({d: 1 for d in reduced_vars & frozenset(ta.inputs.keys())})
-        reduce_dim_counter.subtract({d: 1 for d in reduced_vars & frozenset(tb.inputs.keys())})
-
-        # reduce variables that don't appear in other terms
-        both_vars = frozenset(ta.inputs.keys()) | frozenset(tb.inputs.keys())
-        path_end_reduced_vars = frozenset(d for d in reduced_vars & both_vars
-                                          if reduce_dim_counter[d] == 0)
-
-        # count new appearance of variables that aren't reduced
-        reduce_dim_counter.update({d: 1 for d in reduced_vars & (both_vars - path_end_reduced_vars)})
+    for (a, b), step_reduce_mask in zip(path, step_reduce_masks):
+        a, b = sorted((a, b))
+        ta, tb = operands[a], operands[b]
+        operands[a] = operands[b] = None
 
+        path_end_reduced_vars = frozenset(k for k, bit in var_bits.items() if step_reduce_mask & bit)
         path_end = Contraction(red_op if path_end_reduced_vars else nullop, bin_op, path_end_reduced_vars, ta, tb)
         operands.append(path_end)
 
     # reduce any remaining dims, if necessary
-    final_reduced_vars = frozenset(d for (d, count) in reduce_dim_counter.items()
-                                   if count > 0) & reduced_vars
+    final_reduced_vars = frozenset(k for k, bit in var_bits.items() if final_reduce_mask & bit)
     if final_reduced_vars:
         path_end = path_end.reduce(red_op, final_reduced_vars)
     return path_end
@@ -99,7 +99,7 @@ class Tensor(Funsor, metaclass=TensorMeta):
     def __init__(self, data, inputs=None, dtype="real"):
         assert ops.is_numeric_array(data)
         assert isinstance(inputs, tuple)
-        if not get_tracing_state():
+        if __debug__ and not get_tracing_state():
             assert len(inputs) <= len(data.shape)
             for (k, d), size in zip(inputs, data.shape):
                 assert d.dtype == size
@@ -151,14 +151,13 @@ class Tensor(Funsor, metaclass=TensorMeta):
     def align(self, names):
         assert isinstance(names, tuple)
         assert all(name in self.inputs for name in names)
-        if not names or names == tuple(self.inputs):
+        if not names or names == tuple(self.inputs)[:len(names)]:
             return self
 
         inputs = OrderedDict((name, self.inputs[name]) for name in names)
         inputs.update(self.inputs)
-        old_dims = tuple(self.inputs)
-        new_dims = tuple(inputs)
-        permutation = tuple(old_dims.index(d) for d in new_dims)
+        positions = {d: i for i, d in enumerate(self.inputs)}
+        permutation = tuple(positions[d] for d in inputs)
         permutation = permutation + tuple(range(len(permutation), len(permutation) + len(self.output.shape)))
         data = ops.permute(self.data, permutation)
         return Tensor(data, inputs, self.dtype)
@@ -184,18 +183,29 @@ class Tensor(Funsor, metaclass=TensorMeta):
                     elif isinstance(v, Slice):
                         del subs[k]
                         k = v.name
+                        # A slice over the full range is just a rename.
+                        if v.slice != slice(0, d.dtype, 1):
+                            if slices is None:
+                                slices = [slice(None)] * len(self.data.shape)
+                            slices[i] = v.slice
                         d = v.inputs[v.name]
-                        if slices is None:
-                            slices = [slice(None)] * len(self.data.shape)
-                        slices[i] = v.slice
                 inputs[k] = d
             data = self.data[tuple(slices)] if slices else self.data
             result = Tensor(data, inputs, self.dtype)
+            if not subs:
+                return result
             return result.eager_subs(tuple(subs.items()))
 
         # materialize after checking for renaming case
         subs = OrderedDict((k, self.materialize(v)) for k, v in subs.items())
 
+        # Use basic indexing, which avoids building index tensors, when
+        # substituting only constants.
+        if all(isinstance(v, Number) for v in subs.values()):
+            index = tuple(int(subs[k].data) if k in subs else slice(None) for k in self.inputs)
+            inputs = OrderedDict((k, d) for k, d in self.inputs.items() if k not in subs)
+            return Tensor(self.data[index], inputs, self.dtype)
+
         # Compute result shapes.
         inputs = OrderedDict()
         for k, domain in self.inputs.items():
@@ -245,33 +255,52 @@ class Tensor(Funsor, metaclass=TensorMeta):
 
     def eager_unary(self, op):
         dtype = find_domain(op, self.output).dtype
-        if op in REDUCE_OP_TO_NUMERIC:
+        numeric_op = REDUCE_OP_TO_NUMERIC.get(op)
+        if numeric_op is not None:
             batch_dim = len(self.data.shape) - len(self.output.shape)
             data = self.data.reshape(self.data.shape[:batch_dim] + (-1,))
-            data = REDUCE_OP_TO_NUMERIC[op](data, -1)
+            data = numeric_op(data, -1)
             return Tensor(data, self.inputs, dtype)
         return Tensor(op(self.data), self.inputs, dtype)
 
     def eager_reduce(self, op, reduced_vars):
-        if op in REDUCE_OP_TO_NUMERIC:
-            numeric_op = REDUCE_OP_TO_NUMERIC[op]
+        numeric_op = REDUCE_OP_TO_NUMERIC.get(op)
+        if numeric_op is not None:
             assert isinstance(reduced_vars, frozenset)
             self_vars = frozenset(self.inputs)
             reduced_vars = reduced_vars & self_vars
+            if not reduced_vars:
+                return self
+            assert not any(self.inputs[k].shape for k in reduced_vars)
             if reduced_vars == self_vars and not self.output.shape:
                 return Tensor(numeric_op(self.data, None), dtype=self.dtype)
 
+            inputs = OrderedDict((k, v) for k, v in self.inputs.items()
+                                 if k not in reduced_vars)
+            if numeric_op is ops.logsumexp:
+                # Reduce all dims in a single call, rather than one max/exp/log pass per dim.
+                dims = tuple(i for i, k in enumerate(self.inputs) if k in reduced_vars)
+                return Tensor(numeric_op(self.data, dims), inputs, self.dtype)
+
+            if numeric_op in _FLATTEN_REDUCE_OPS:
+                # Move reduced dims together and reduce them as one flattened dim.
+                keys = tuple(self.inputs)
+                kept = tuple(i for i, k in enumerate(keys) if k not in reduced_vars)
+                reduced = tuple(i for i, k in enumerate(keys) if k in reduced_vars)
+                data = self.data
+                if kept + reduced != tuple(range(len(keys))):
+                    data = ops.permute(data, kept + reduced + tuple(range(len(keys), len(data.shape))))
+                data = data.reshape(data.shape[:len(kept)] + (-1,) + self.output.shape)
+                return Tensor(numeric_op(data, len(kept)), inputs, self.dtype)
+
             # Reduce one dim at a time.
             data = self.data
             offset = 0
-            for k, domain in self.inputs.items():
+            for k in self.inputs:
                 if k in reduced_vars:
-                    assert not domain.shape
                     data = numeric_op(data, offset)
                 else:
                     offset += 1
-            inputs = OrderedDict((k, v) for k, v in self.inputs.items()
-                                 if k not in reduced_vars)
             return Tensor(data, inputs, self.dtype)
         return super(Tensor, self).eager_reduce(op, reduced_vars)
 
@@ -316,9 +345,9 @@ class Tensor(Funsor, metaclass=TensorMeta):
             shape = sample_shape + flat_logits.shape[:-1]
             logit_max = np.amax(flat_logits, -1, keepdims=True)
             probs = np.exp(flat_logits - logit_max)
-            probs = probs / np.sum(probs, -1, keepdims=True)
+            # Scale the uniform draws by the total mass rather than normalizing probs.
             s = np.cumsum(probs, -1)
-            r = np.random.rand(*shape)
+            r = np.random.rand(*shape) * s[..., -1]
             flat_sample = np.sum(s < np.expand_dims(r, -1), axis=-1)
 
         assert flat_sample.shape == sample_shape + batch_shape
@@ -472,14 +501,16 @@ def align_tensor(new_inputs, x, expand=False):
     if old_inputs == new_inputs:
         return data
 
+    perm, index = _align_plan(tuple(old_inputs), tuple(new_inputs), len(data.shape))
+
     # Permute squashed input dims.
-    x_keys = tuple(old_inputs)
-    data = ops.permute(data, tuple(x_keys.index(k) for k in new_inputs if k in old_inputs) +
-                       tuple(range(len(old_inputs), len(data.shape))))
+    if perm is not None:
+        data = ops.permute(data, perm)
 
-    # Unsquash multivariate input dims by filling in ones.
-    data = data.reshape(tuple(old_inputs[k].dtype if k in old_inputs else 1 for k in new_inputs) +
-                        x.output.shape)
+    # Unsquash multivariate input dims by inserting singleton dims,
+    # which is a metadata-only view rather than a reshape.
+    if index is not None:
+        data = data[index]
 
     # Optionally expand new dims.
     if expand:
@@ -487,6 +518,24 @@ def align_tensor(new_inputs, x, expand=False):
     return data
 
 
+@functools.lru_cache(maxsize=4096)
+def _align_plan(old_keys, new_keys, ndim):
+    """
+    Cached layout plan for :func:`align_tensor`, returning a permutation and
+    an index inserting missing dims; either may be None if not needed.
+    """
+    positions = {k: i for i, k in enumerate(old_keys)}
+    perm = tuple(positions[k] for k in new_keys if k in positions)
+    if perm == tuple(range(len(perm))):
+        perm = None
+    else:
+        perm = perm + tuple(range(len(old_keys), ndim))
+    index = None
+    if len(positions) < len(new_keys):
+        index = tuple(slice(None) if k in positions else None for k in new_keys) + (Ellipsis,)
+    return perm, index
+
+
 def align_tensors(*args, **kwargs):
     r"""
     Permute multiple tensors before applying a broadcasted op.
@@ -526,7 +575,7 @@ def tensor_to_data(x, name_to_dim=None):
         # permute packed dimensions to correct order
         unsorted_dims = [name_to_dim[name] for name in x.inputs]
         dims = sorted(unsorted_dims)
-        permutation = [unsorted_dims.index(dim) for dim in dims] + \
+        permutation = sorted(range(len(dims)), key=unsorted_dims.__getitem__) + \
             list(range(len(dims), len(dims) + len(x.output.shape)))
         data = ops.permute(data, permutation)
         # expand
@@ -548,15 +597,28 @@ def eager_binary_number_tensor(op, lhs, rhs):
     return Tensor(data, rhs.inputs, rhs.dtype)
 
 
+def _align_binary(lhs, rhs):
+    """
+    Align the data of two tensors, leaving the operand whose inputs already
+    cover the other's untouched. Input order matches :func:`align_tensors`.
+    """
+    lhs_inputs, rhs_inputs = lhs.inputs, rhs.inputs
+    if lhs_inputs == rhs_inputs:
+        return lhs_inputs, lhs.data, rhs.data
+    if all(k in lhs_inputs for k in rhs_inputs):
+        return lhs_inputs, lhs.data, align_tensor(lhs_inputs, rhs)
+    if all(k in rhs_inputs for k in lhs_inputs) and \
+            tuple(rhs_inputs)[:len(lhs_inputs)] == tuple(lhs_inputs):
+        return rhs_inputs, align_tensor(rhs_inputs, lhs), rhs.data
+    inputs, (lhs_data, rhs_data) = align_tensors(lhs, rhs)
+    return inputs, lhs_data, rhs_data
+
+
 @eager.register(Binary, Op, Tensor, Tensor)
 def eager_binary_tensor_tensor(op, lhs, rhs):
     # Compute inputs and outputs.
     dtype = find_domain(op, lhs.output, rhs.output).dtype
-    if lhs.inputs == rhs.inputs:
-        inputs = lhs.inputs
-        lhs_data, rhs_data = lhs.data, rhs.data
-    else:
-        inputs, (lhs_data, rhs_data) = align_tensors(lhs, rhs)
+    inputs, lhs_data, rhs_data = _align_binary(lhs, rhs)
 
     # Reshape to support broadcasting of output shape.
     if inputs:
@@ -581,11 +643,7 @@ def eager_binary_tensor_tensor(op, lhs, rhs):
 def eager_binary_tensor_tensor(op, lhs, rhs):
     # Compute inputs and outputs.
     dtype = find_domain(op, lhs.output, rhs.output).dtype
-    if lhs.inputs == rhs.inputs:
-        inputs = lhs.inputs
-        lhs_data, rhs_data = lhs.data, rhs.data
-    else:
-        inputs, (lhs_data, rhs_data) = align_tensors(lhs, rhs)
+    inputs, lhs_data, rhs_data = _align_binary(lhs, rhs)
     if len(lhs.shape) == 1:
         lhs_data = ops.unsqueeze(lhs_data, -2)
     if len(rhs.shape) == 1:
@@ -658,10 +716,7 @@ def eager_getitem_tensor_tensor(op, lhs, rhs):
     assert rhs.output == bint(lhs.output.shape[op.offset])
 
     # Compute inputs and outputs.
-    if lhs.inputs == rhs.inputs:
-        inputs, lhs_data, rhs_data = lhs.inputs, lhs.data, rhs.data
-    else:
-        inputs, (lhs_data, rhs_data) = align_tensors(lhs, rhs)
+    inputs, lhs_data, rhs_data = _align_binary(lhs, rhs)
     if len(lhs.output.shape) > 1:
         rhs_data = rhs_data.reshape(rhs_data.shape + (1,) * (len(lhs.output.shape) - 1))
 
@@ -790,7 +845,10 @@ def _(arg, indent, out):
 def eager_function(fn, output, args):
     if not all(isinstance(arg, (Number, Tensor)) for arg in args):
         return None  # defer to default implementation
-    inputs, tensors = align_tensors(*args)
+    if args and all(arg.inputs == args[0].inputs for arg in args[1:]):
+        inputs, tensors = args[0].inputs, [arg.data for arg in args]
+    else:
+        inputs, tensors = align_tensors(*args)
     data = fn(*tensors)
     result = Tensor(data, inputs, dtype=output.dtype)
     assert result.output == output
@@ -923,6 +981,22 @@ class Einsum(Funsor):
         return 'Einsum({}, {})'.format(repr(self.equation), str(self.operands))
 
 
+BACKEND_TO_EINSUM_BACKEND = {
+    "numpy": "numpy",
+    "torch": "torch",
+    "jax": "jax.numpy",
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def cached_contract_expression(equation, *shapes):
+    """
+    Cached wrapper around :func:`opt_einsum.contract_expression` so that
+    repeated contractions of the same pattern skip path optimization.
+    """
+    return opt_einsum.contract_expression(equation, *shapes)
+
+
 @eager.register(Einsum, str, tuple)
 def eager_einsum(equation, operands):
     if all(isinstance(x, Tensor) for x in operands):
@@ -949,7 +1023,13 @@ def eager_einsum(equation, operands):
         out = ''.join(new_symbols[k] for k in inputs) + out
         equation = ','.join(ins) + '->' + out
 
-        data = ops.einsum(equation, *[x.data for x in operands])
+        if len(operands) > 2:
+            # Reuse a compiled contraction for each equation and shapes.
+            shapes = tuple(tuple(x.data.shape) for x in operands)
+            data = cached_contract_expression(equation, *shapes)(*[x.data for x in operands],
+                                                                 backend=BACKEND_TO_EINSUM_BACKEND[get_backend()])
+        else:
+            data = ops.einsum(equation, *[x.data for x in operands])
         return Tensor(data, inputs)
 
     return None  # defer to default implementation
@@ -1025,6 +1105,9 @@ REDUCE_OP_TO_NUMERIC = {
     ops.max: ops.amax,
 }
 
+# Reductions whose result does not depend on the order of elements, and hence
+# are safe to apply to several dims flattened into one.
+_FLATTEN_REDUCE_OPS = frozenset([ops.all, ops.any, ops.amin, ops.amax])
 
 __all__ = [
     'Einsum',
@@ -68,8 +68,9 @@ def reflect(cls, *args, **kwargs):
     # JAX DeviceArray has .__hash__ method but raise the unhashable error there.
     cache_key = tuple(id(arg) if type(arg).__name__ == "DeviceArray" or not isinstance(arg, Hashable)
                       else arg for arg in args)
-    if cache_key in cls._cons_cache:
-        return cls._cons_cache[cache_key]
+    result = cls._cons_cache.get(cache_key)
+    if result is not None:
+        return result
 
     arg_types = tuple(typing.Tuple[tuple(map(type, arg))]
                       if (type(arg) is tuple and all(isinstance(a, Funsor) for a in arg))
@@ -335,9 +336,10 @@ class Funsor(object, metaclass=FunsorMeta):
         fresh = frozenset() if fresh is None else fresh
         bound = frozenset() if bound is None else bound
         assert isinstance(inputs, OrderedDict)
-        for name, input_ in inputs.items():
-            assert isinstance(name, str)
-            assert isinstance(input_, Domain)
+        if __debug__:
+            for name, input_ in inputs.items():
+                assert isinstance(name, str)
+                assert isinstance(input_, Domain)
         assert isinstance(output, Domain)
         assert isinstance(fresh, frozenset)
         assert isinstance(bound, frozenset)
@@ -387,7 +389,9 @@ class Funsor(object, metaclass=FunsorMeta):
         Partially evaluates this funsor by substituting dimensions.
         """
         # Eagerly restrict to this funsor's inputs.
-        subs = OrderedDict(zip(self.inputs, args))
+        if not args and not any(k in kwargs for k in self.inputs):
+            return self
+        subs = dict(zip(self.inputs, args))
         for k in self.inputs:
             if k in kwargs:
                 subs[k] = kwargs[k]
@@ -859,20 +863,24 @@ class Subs(Funsor, metaclass=SubsMeta):
     def __init__(self, arg, subs):
         assert isinstance(arg, Funsor)
         assert isinstance(subs, tuple)
-        for key, value in subs:
-            assert isinstance(key, str)
-            assert key in arg.inputs
-            assert isinstance(value, Funsor)
-        inputs = arg.inputs.copy()
-        for key, value in subs:
-            del inputs[key]
+        if __debug__:
+            for key, value in subs:
+                assert isinstance(key, str)
+                assert key in arg.inputs
+                assert isinstance(value, Funsor)
+        bound = frozenset(key for key, value in subs)
+        inputs = OrderedDict((k, d) for k, d in arg.inputs.items() if k not in bound)
         for key, value in subs:
             inputs.update(value.inputs)
         fresh = frozenset()
-        bound = frozenset(key for key, value in subs)
         super(Subs, self).__init__(inputs, arg.output, fresh, bound)
         self.arg = arg
-        self.subs = OrderedDict(subs)
+
+    @lazy_property
+    def subs(self):
+        # Built on first use, since most Subs terms are consumed by
+        # interpreters that read ._ast_values directly.
+        return OrderedDict(self._ast_values[1])
 
     def __repr__(self):
         return 'Subs({}, {})'.format(self.arg, self.subs)
@@ -115,7 +115,7 @@ def assert_close(actual, expected, atol=1e-6, rtol=1e-6):
         assert actual.dtype == expected.dtype, msg
         assert actual.shape == expected.shape, msg
         if actual.dtype in (torch.long, torch.uint8, torch.bool):
-            assert (actual == expected).all(), msg
+            assert torch.equal(actual, expected), msg
         else:
             eq = (actual == expected)
             if eq.all():
@@ -168,7 +168,8 @@ def check_funsor(x, inputs, output, data=None):
     Check dims and shape modulo reordering.
     """
     assert isinstance(x, Funsor)
-    assert dict(x.inputs) == dict(inputs)
+    assert len(x.inputs) == len(inputs)
+    assert all(inputs.get(k) == d for k, d in x.inputs.items()), (x.inputs, inputs)
     if output is not None:
         assert x.output == output
     if data is not None:
@@ -177,7 +178,12 @@ def check_funsor(x, inputs, output, data=None):
         else:
             x_data = x.align(tuple(inputs)).data
         if inputs or output.shape:
-            assert (x_data == data).all()
+            if get_backend() == "torch":
+                import torch
+
+                assert torch.equal(x_data, data)
+            else:
+                assert (x_data == data).all()
         else:
             assert x_data == data
 
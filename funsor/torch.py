@@ -65,14 +65,24 @@ def _all(x, dim):
     return x.all() if dim is None else x.all(dim=dim)
 
 
-@ops.amax.register(torch.Tensor, (int, type(None)))
-def _amax(x, dim, keepdims=False):
-    return x.max() if dim is None else x.max(dim, keepdims)[0]
+if hasattr(torch, "amax"):
+    # torch.amax and torch.amin do not allocate the unused argmax/argmin indices.
+    @ops.amax.register(torch.Tensor, (int, type(None)))
+    def _amax(x, dim, keepdims=False):
+        return x.max() if dim is None else torch.amax(x, dim, keepdims)
 
+    @ops.amin.register(torch.Tensor, (int, type(None)))
+    def _amin(x, dim, keepdims=False):
+        return x.min() if dim is None else torch.amin(x, dim, keepdims)
 
-@ops.amin.register(torch.Tensor, (int, type(None)))
-def _amin(x, dim, keepdims=False):
-    return x.min() if dim is None else x.min(dim, keepdims)[0]
+else:
+    @ops.amax.register(torch.Tensor, (int, type(None)))
+    def _amax(x, dim, keepdims=False):
+        return x.max() if dim is None else x.max(dim, keepdims)[0]
+
+    @ops.amin.register(torch.Tensor, (int, type(None)))
+    def _amin(x, dim, keepdims=False):
+        return x.min() if dim is None else x.min(dim, keepdims)[0]
 
 
 @ops.any.register(torch.Tensor, (int, type(None)))
@@ -145,7 +155,7 @@ def _log(x):
     return x.log()
 
 
-@ops.logsumexp.register(torch.Tensor, (int, type(None)))
+@ops.logsumexp.register(torch.Tensor, (int, tuple, type(None)))
 def _logsumexp(x, dim):
     return x.reshape(-1).logsumexp(0) if dim is None else x.logsumexp(dim)
 
@@ -102,3 +102,75 @@ def test_eager_contract_tensor_tensor(red_op, bin_op, x_inputs, x_shape, y_input
             expected = xy.reduce(red_op, reduced_vars)
             actual = Contraction(red_op, bin_op, reduced_vars, (x, y))
             assert_close(actual, expected, atol=1e-4, rtol=5e-4 if backend == "jax" else 1e-4)
+
+
+@pytest.mark.parametrize("shape", [(), (2,)], ids=str)
+@pytest.mark.parametrize("inputs", [
+    # terms with equal inputs are combined with one stacked reduction
+    ("i", "i", "i"),
+    ("ij", "ji", "ij"),
+    # terms that broadcast are combined pairwise
+    ("i", "j", "ij"),
+    ("", "i", "j", "k"),
+    ("ij", "jk", "", "ki"),
+], ids=str)
+@pytest.mark.parametrize("bin_op", [ops.add, ops.mul, ops.logaddexp], ids=str)
+def test_eager_contract_tensors_nullop(bin_op, inputs, shape):
+    all_inputs = OrderedDict([("i", bint(4)), ("j", bint(5)), ("k", bint(6))])
+    terms = tuple(random_tensor(OrderedDict((k, all_inputs[k]) for k in term_inputs), reals(*shape))
+                  for term_inputs in inputs)
+
+    expected = terms[0]
+    for term in terms[1:]:
+        expected = bin_op(expected, term)
+    actual = Contraction(ops.nullop, bin_op, frozenset(), *terms)
+    assert isinstance(actual, Tensor)
+    assert_close(actual, expected.align(tuple(actual.inputs)), atol=1e-4, rtol=1e-4)
+
+
+@pytest.mark.parametrize("p,i,j", [(0, 3, 4), (2, 0, 4), (2, 3, 0)], ids=str)
+def test_eager_contract_tensor_tensor_zero_size(p, i, j):
+    x = random_tensor(OrderedDict([("p", bint(p)), ("i", bint(i)), ("j", bint(j))]))
+    y = random_tensor(OrderedDict([("p", bint(p)), ("j", bint(j)), ("k", bint(5))]))
+
+    expected = (x * y).reduce(ops.add, "j")
+    actual = Contraction(ops.add, ops.mul, frozenset(["j"]), x, y)
+    check_funsor(actual, expected.inputs, expected.output)
+    assert_close(actual, expected.align(tuple(actual.inputs)))
+
+
+@pytest.mark.skipif(get_backend() != "torch", reason="requires autograd")
+def test_eager_contract_tensor_tensor_inf_grad():
+    import torch
+
+    x_data = torch.randn(3, 4)
+    x_data[0] = -float('inf')
+    x_data.requires_grad_()
+    y_data = torch.randn(4, 5)
+    x = Tensor(x_data, OrderedDict([("i", bint(3)), ("j", bint(4))]))
+    y = Tensor(y_data, OrderedDict([("j", bint(4)), ("k", bint(5))]))
+
+    actual = Contraction(ops.logaddexp, ops.add, frozenset(["j"]), x, y).align(("i", "k")).data
+    assert (actual[0] == -float('inf')).all()
+    actual[1:].sum().backward()
+
+    expected_data = x_data.detach()[1:].requires_grad_()
+    (expected_data.unsqueeze(-1) + y_data).logsumexp(1).sum().backward()
+    assert (x_data.grad[0] == 0).all()
+    assert_close(x_data.grad[1:], expected_data.grad)
+
+
+def test_normalize_flatten_nested_contraction():
+    terms = [random_tensor(OrderedDict([(name, bint(2))])) for name in "abcde"]
+    with interpretation(reflect):
+        expr = terms[0]
+        for term in terms[1:]:
+            expr = Contraction(ops.nullop, ops.add, frozenset(), expr, term)
+        expr = Contraction(ops.logaddexp, ops.add, frozenset("x"), expr, random_tensor(OrderedDict(x=bint(2))))
+
+    with interpretation(normalize):
+        actual = reinterpret(expr)
+
+    assert isinstance(actual, Contraction)
+    assert len(actual.terms) == len(terms) + 1
+    assert all(x is y for x, y in zip(actual.terms, terms))
@@ -8,13 +8,15 @@ import torch
 from pyro.ops.contract import einsum as pyro_einsum
 
 import funsor
+import funsor.ops as ops
+from funsor.cnf import Contraction
 from funsor.distributions import Categorical
 from funsor.domains import bint
 from funsor.einsum import einsum, naive_contract_einsum, naive_einsum, naive_plated_einsum
 from funsor.interpreter import interpretation, reinterpret
-from funsor.optimizer import apply_optimizer
+from funsor.optimizer import _replay_path, apply_optimizer
 from funsor.tensor import Tensor
-from funsor.terms import Variable, normalize, reflect
+from funsor.terms import Variable, lazy, normalize, reflect
 from funsor.testing import assert_close, make_chain_einsum, make_einsum_example, make_hmm_einsum, make_plated_hmm_einsum
 from funsor.util import get_backend
 
@@ -134,3 +136,44 @@ def test_optimized_plated_einsum(equation, plates, backend):
         for i, output_dim in enumerate(output):
             assert output_dim in actual.inputs
             assert actual.inputs[output_dim].dtype == sizes[output_dim]
+
+
+def test_replay_path():
+    # a = 1, b = 2, c = 4, d = 8; d is kept and the other variables are reduced
+    input_masks = [1 | 2, 2 | 4, 4, 8]
+    path = [(0, 1), (2, 4), (3, 5)]
+    step_reduce_masks, final_reduce_mask = _replay_path(input_masks, path, 1 | 2 | 4)
+
+    # a and b leave with the first contraction, c only once the third term is absorbed,
+    # and the disjoint term with d is an outer product that reduces nothing
+    assert step_reduce_masks == [1 | 2, 4, 0]
+    assert final_reduce_mask == 0
+
+
+def test_replay_path_no_steps():
+    step_reduce_masks, final_reduce_mask = _replay_path([1 | 2], [], 1)
+    assert step_reduce_masks == []
+    assert final_reduce_mask == 1
+
+
+def test_optimize_three_terms_cheapest_pair_first():
+    x = Tensor(torch.randn(3, 2), OrderedDict([('a', bint(3)), ('b', bint(2))]))
+    y = Tensor(torch.randn(2, 10), OrderedDict([('b', bint(2)), ('c', bint(10))]))
+    z = Tensor(torch.randn(10), OrderedDict([('c', bint(10))]))
+    expected = (x * y * z).reduce(ops.add, frozenset(['b', 'c']))
+
+    # contracting y with z first removes the large dimension c right away,
+    # whereas the first pair (x, y) would build an intermediate over a and c
+    with interpretation(lazy):
+        expr = Contraction(ops.add, ops.mul, frozenset(['b', 'c']), x, y, z)
+        actual = apply_optimizer(expr)
+
+    assert isinstance(actual, Contraction)
+    outer_x, inner = actual.terms
+    assert outer_x.data is x.data
+    assert isinstance(inner, Contraction)
+    inner_y, inner_z = inner.terms
+    assert inner_y.data is y.data
+    assert inner_z.data is z.data
+
+    assert_close(reinterpret(actual), expected)
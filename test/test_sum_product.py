@@ -227,7 +227,7 @@ def test_sequential_sum_product_bias_1(num_steps, dim):
     assert set(result.inputs) == {"bias", "x_prev", "x_curr"}
 
 
-@pytest.mark.xfail(reason="missing pattern for Gaussian(x=y[z]) for real x")
+@pytest.mark.xfail(reason="missing pattern for Gaussian(x=y[z]) for real x", run=False)
 @pytest.mark.parametrize("num_steps", [1, 2, 3, 10])
 @pytest.mark.parametrize("num_sensors", [2])
 @pytest.mark.parametrize("dim", [1, 2, 3])
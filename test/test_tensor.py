@@ -13,7 +13,7 @@ import funsor.ops as ops
 from funsor.domains import Domain, bint, find_domain, reals
 from funsor.interpreter import interpretation
 from funsor.terms import Cat, Lambda, Number, Slice, Stack, Variable, lazy
-from funsor.testing import (assert_close, assert_equiv, astype, check_funsor, empty,
+from funsor.testing import (assert_close, assert_equiv, astype, check_funsor,
                             numeric_array, rand, randn, random_tensor, zeros)
 from funsor.tensor import REDUCE_OP_TO_NUMERIC, Einsum, Tensor, align_tensors, stack, tensordot
 from funsor.util import get_backend
@@ -91,8 +91,60 @@ def test_indexing():
     check_funsor(x(j=2, k=3), {'i': bint(4)}, reals(), data[:, 2])
 
 
-def test_advanced_indexing_shape():
-    I, J, M, N = 4, 4, 2, 3
+I, J, M, N = 4, 4, 2, 3
+
+# each case lists the expected inputs of the result in data order,
+# i.e. the input (or its substituted index) for dim i first, then for dim j
+ADVANCED_INDEXING_CASES = [
+    pytest.param((), {'i': 'm'}, OrderedDict([('m', bint(M)), ('j', bint(J))]),
+                 id='x(i=m)'),
+    pytest.param((), {'i': 'm', 'j': 'n'}, OrderedDict([('m', bint(M)), ('n', bint(N))]),
+                 id='x(i=m,j=n)'),
+    pytest.param((), {'i': 'm', 'j': 'n', 'k': 'm'}, OrderedDict([('m', bint(M)), ('n', bint(N))]),
+                 id='x(i=m,j=n,k=m)'),
+    pytest.param((), {'i': 'm', 'k': 'm'}, OrderedDict([('m', bint(M)), ('j', bint(J))]),
+                 id='x(i=m,k=m)'),
+    pytest.param((), {'i': 'n'}, OrderedDict([('n', bint(N)), ('j', bint(J))]),
+                 id='x(i=n)'),
+    pytest.param((), {'i': 'n', 'k': 'm'}, OrderedDict([('n', bint(N)), ('j', bint(J))]),
+                 id='x(i=n,k=m)'),
+    pytest.param((), {'j': 'm'}, OrderedDict([('i', bint(I)), ('m', bint(M))]),
+                 id='x(j=m)'),
+    pytest.param((), {'j': 'm', 'i': 'n'}, OrderedDict([('n', bint(N)), ('m', bint(M))]),
+                 id='x(j=m,i=n)'),
+    pytest.param((), {'j': 'm', 'i': 'n', 'k': 'm'}, OrderedDict([('n', bint(N)), ('m', bint(M))]),
+                 id='x(j=m,i=n,k=m)'),
+    pytest.param((), {'j': 'm', 'k': 'm'}, OrderedDict([('i', bint(I)), ('m', bint(M))]),
+                 id='x(j=m,k=m)'),
+    pytest.param((), {'j': 'n'}, OrderedDict([('i', bint(I)), ('n', bint(N))]),
+                 id='x(j=n)'),
+    pytest.param((), {'j': 'n', 'k': 'm'}, OrderedDict([('i', bint(I)), ('n', bint(N))]),
+                 id='x(j=n,k=m)'),
+    pytest.param(('m',), {}, OrderedDict([('m', bint(M)), ('j', bint(J))]),
+                 id='x(m)'),
+    pytest.param(('m',), {'j': 'n'}, OrderedDict([('m', bint(M)), ('n', bint(N))]),
+                 id='x(m,j=n)'),
+    pytest.param(('m',), {'j': 'n', 'k': 'm'}, OrderedDict([('m', bint(M)), ('n', bint(N))]),
+                 id='x(m,j=n,k=m)'),
+    pytest.param(('m',), {'k': 'm'}, OrderedDict([('m', bint(M)), ('j', bint(J))]),
+                 id='x(m,k=m)'),
+    pytest.param(('m', 'n'), {}, OrderedDict([('m', bint(M)), ('n', bint(N))]),
+                 id='x(m,n)'),
+    pytest.param(('m', 'n'), {'k': 'm'}, OrderedDict([('m', bint(M)), ('n', bint(N))]),
+                 id='x(m,n,k=m)'),
+    pytest.param(('n',), {}, OrderedDict([('n', bint(N)), ('j', bint(J))]),
+                 id='x(n)'),
+    pytest.param(('n',), {'k': 'm'}, OrderedDict([('n', bint(N)), ('j', bint(J))]),
+                 id='x(n,k=m)'),
+    pytest.param(('n', 'm'), {}, OrderedDict([('n', bint(N)), ('m', bint(M))]),
+                 id='x(n,m)'),
+    pytest.param(('n', 'm'), {'k': 'm'}, OrderedDict([('n', bint(N)), ('m', bint(M))]),
+                 id='x(n,m,k=m)'),
+]
+
+
+@pytest.mark.parametrize('args,kwargs,expected_inputs', ADVANCED_INDEXING_CASES)
+def test_advanced_indexing_shape(args, kwargs, expected_inputs):
     x = Tensor(randn((I, J)), OrderedDict([
         ('i', bint(I)),
         ('j', bint(J)),
@@ -100,29 +152,19 @@ def test_advanced_indexing_shape():
     m = Tensor(numeric_array([2, 3]), OrderedDict([('m', bint(M))]), I)
     n = Tensor(numeric_array([0, 1, 1]), OrderedDict([('n', bint(N))]), J)
     assert x.data.shape == (I, J)
-
-    check_funsor(x(i=m), {'j': bint(J), 'm': bint(M)}, reals())
-    check_funsor(x(i=m, j=n), {'m': bint(M), 'n': bint(N)}, reals())
-    check_funsor(x(i=m, j=n, k=m), {'m': bint(M), 'n': bint(N)}, reals())
-    check_funsor(x(i=m, k=m), {'j': bint(J), 'm': bint(M)}, reals())
-    check_funsor(x(i=n), {'j': bint(J), 'n': bint(N)}, reals())
-    check_funsor(x(i=n, k=m), {'j': bint(J), 'n': bint(N)}, reals())
-    check_funsor(x(j=m), {'i': bint(I), 'm': bint(M)}, reals())
-    check_funsor(x(j=m, i=n), {'m': bint(M), 'n': bint(N)}, reals())
-    check_funsor(x(j=m, i=n, k=m), {'m': bint(M), 'n': bint(N)}, reals())
-    check_funsor(x(j=m, k=m), {'i': bint(I), 'm': bint(M)}, reals())
-    check_funsor(x(j=n), {'i': bint(I), 'n': bint(N)}, reals())
-    check_funsor(x(j=n, k=m), {'i': bint(I), 'n': bint(N)}, reals())
-    check_funsor(x(m), {'j': bint(J), 'm': bint(M)}, reals())
-    check_funsor(x(m, j=n), {'m': bint(M), 'n': bint(N)}, reals())
-    check_funsor(x(m, j=n, k=m), {'m': bint(M), 'n': bint(N)}, reals())
-    check_funsor(x(m, k=m), {'j': bint(J), 'm': bint(M)}, reals())
-    check_funsor(x(m, n), {'m': bint(M), 'n': bint(N)}, reals())
-    check_funsor(x(m, n, k=m), {'m': bint(M), 'n': bint(N)}, reals())
-    check_funsor(x(n), {'j': bint(J), 'n': bint(N)}, reals())
-    check_funsor(x(n, k=m), {'j': bint(J), 'n': bint(N)}, reals())
-    check_funsor(x(n, m), {'m': bint(M), 'n': bint(N)}, reals())
-    check_funsor(x(n, m, k=m), {'m': bint(M), 'n': bint(N)}, reals())
+    indices = {'m': m, 'n': n}
+    actual = x(*(indices[v] for v in args), **{k: indices[v] for k, v in kwargs.items()})
+
+    subs = dict(zip(('i', 'j'), args))
+    subs.update(kwargs)
+    i, j = indices.get(subs.get('i')), indices.get(subs.get('j'))
+    if i is not None and j is not None:
+        expected_data = x.data[i.data.reshape((-1, 1)), j.data]
+    elif i is not None:
+        expected_data = x.data[i.data]
+    else:
+        expected_data = x.data[:, j.data]
+    check_funsor(actual, expected_inputs, reals(), expected_data)
 
 
 def test_slice_simple():
@@ -163,6 +205,15 @@ def test_arange_simple():
     assert_close(f, f(i="i", j=f.new_arange("j", 4)))
 
 
+def test_arange_fresh():
+    f = Tensor(randn((3,)))
+    x = f.new_arange("i", 4)
+    y = f.new_arange("i", 4)
+    assert x.data is not y.data
+    x.data[0] = 1
+    assert y.data[0] == 0
+
+
 @pytest.mark.parametrize("stop", [0, 1, 2, 10])
 def test_arange_1(stop):
     t = randn((10, 2))
@@ -208,10 +259,8 @@ def test_advanced_indexing_tensor(output_shape):
         ('v', bint(6)),
     ]), bint(4))
 
-    expected_data = empty((5, 6) + output_shape)
-    for u in range(5):
-        for v in range(6):
-            expected_data[u, v] = x.data[i.data[u], j.data[v, u], k.data[v]]
+    # expected_data[u, v] = x.data[i.data[u], j.data[v, u], k.data[v]]
+    expected_data = x.data[i.data.reshape((5, 1)), ops.permute(j.data, (1, 0)), k.data.reshape((1, 6))]
     expected = Tensor(expected_data, OrderedDict([
         ('u', bint(5)),
         ('v', bint(6)),
@@ -250,13 +299,11 @@ def test_advanced_indexing_lazy(output_shape):
         j = Number(2, 3) - v
         k = u + v
 
-    expected_data = empty((2, 3) + output_shape)
     i_data = x.materialize(i).data
     j_data = x.materialize(j).data
-    k_data = x.materialize(k).data
-    for u in range(2):
-        for v in range(3):
-            expected_data[u, v] = x.data[i_data[u], j_data[v], k_data[u, v]]
+    k_data = x.materialize(k).align(('u', 'v')).data
+    # expected_data[u, v] = x.data[i_data[u], j_data[v], k_data[u, v]]
+    expected_data = x.data[i_data.reshape((2, 1)), j_data.reshape((1, 3)), k_data]
     expected = Tensor(expected_data, OrderedDict([
         ('u', bint(2)),
         ('v', bint(3)),
@@ -445,48 +492,40 @@ def test_reshape(batch_shape, old_shape, new_shape):
     assert_close(old2, old)
 
 
+GETITEM_NUMBER_KEYS = [
+    (2,),
+    (slice(None), 1),
+    (2, 1),
+    (2, slice(None), 1),
+    (3, Ellipsis),
+    (3, 2, Ellipsis),
+    (Ellipsis, 1),
+    (Ellipsis, 2, 1),
+    (3, Ellipsis, 1),
+]
+
+
 def test_getitem_number_0_inputs():
     data = randn((5, 4, 3, 2))
     x = Tensor(data)
-    assert_close(x[2], Tensor(data[2]))
-    assert_close(x[:, 1], Tensor(data[:, 1]))
-    assert_close(x[2, 1], Tensor(data[2, 1]))
-    assert_close(x[2, :, 1], Tensor(data[2, :, 1]))
-    assert_close(x[3, ...], Tensor(data[3, ...]))
-    assert_close(x[3, 2, ...], Tensor(data[3, 2, ...]))
-    assert_close(x[..., 1], Tensor(data[..., 1]))
-    assert_close(x[..., 2, 1], Tensor(data[..., 2, 1]))
-    assert_close(x[3, ..., 1], Tensor(data[3, ..., 1]))
+    for key in GETITEM_NUMBER_KEYS:
+        assert_close(x[key], Tensor(data[key]))
 
 
 def test_getitem_number_1_inputs():
     data = randn((3, 5, 4, 3, 2))
     inputs = OrderedDict([('i', bint(3))])
     x = Tensor(data, inputs)
-    assert_close(x[2], Tensor(data[:, 2], inputs))
-    assert_close(x[:, 1], Tensor(data[:, :, 1], inputs))
-    assert_close(x[2, 1], Tensor(data[:, 2, 1], inputs))
-    assert_close(x[2, :, 1], Tensor(data[:, 2, :, 1], inputs))
-    assert_close(x[3, ...], Tensor(data[:, 3, ...], inputs))
-    assert_close(x[3, 2, ...], Tensor(data[:, 3, 2, ...], inputs))
-    assert_close(x[..., 1], Tensor(data[..., 1], inputs))
-    assert_close(x[..., 2, 1], Tensor(data[..., 2, 1], inputs))
-    assert_close(x[3, ..., 1], Tensor(data[:, 3, ..., 1], inputs))
+    for key in GETITEM_NUMBER_KEYS:
+        assert_close(x[key], Tensor(data[(slice(None),) + key], inputs))
 
 
 def test_getitem_number_2_inputs():
     data = randn((3, 4, 5, 4, 3, 2))
     inputs = OrderedDict([('i', bint(3)), ('j', bint(4))])
     x = Tensor(data, inputs)
-    assert_close(x[2], Tensor(data[:, :, 2], inputs))
-    assert_close(x[:, 1], Tensor(data[:, :, :, 1], inputs))
-    assert_close(x[2, 1], Tensor(data[:, :, 2, 1], inputs))
-    assert_close(x[2, :, 1], Tensor(data[:, :, 2, :, 1], inputs))
-    assert_close(x[3, ...], Tensor(data[:, :, 3, ...], inputs))
-    assert_close(x[3, 2, ...], Tensor(data[:, :, 3, 2, ...], inputs))
-    assert_close(x[..., 1], Tensor(data[..., 1], inputs))
-    assert_close(x[..., 2, 1], Tensor(data[..., 2, 1], inputs))
-    assert_close(x[3, ..., 1], Tensor(data[:, :, 3, ..., 1], inputs))
+    for key in GETITEM_NUMBER_KEYS:
+        assert_close(x[key], Tensor(data[(slice(None), slice(None)) + key], inputs))
 
 
 def test_getitem_variable():
@@ -645,11 +684,12 @@ def test_all_equal(shape):
     assert (x1 != x2).any()
 
 
-def test_function_matmul():
-    @funsor.function(reals(3, 4), reals(4, 5), reals(3, 5))
-    def matmul(x, y):
-        return x @ y
+@funsor.function(reals(3, 4), reals(4, 5), reals(3, 5))
+def matmul(x, y):
+    return x @ y
 
+
+def test_function_matmul():
     check_funsor(matmul, {'x': reals(3, 4), 'y': reals(4, 5)}, reals(3, 5))
 
     x = Tensor(randn((3, 4)))
@@ -660,11 +700,6 @@ def test_function_matmul():
 
 
 def test_function_lazy_matmul():
-
-    @funsor.function(reals(3, 4), reals(4, 5), reals(3, 5))
-    def matmul(x, y):
-        return x @ y
-
     x_lazy = Variable('x', reals(3, 4))
     y = Tensor(randn((4, 5)))
     actual_lazy = matmul(x_lazy, y)
@@ -684,12 +719,12 @@ def _numeric_max_and_argmax(x):
         return np.max(x, axis=-1), np.argmax(x, axis=-1)
 
 
-def test_function_nested_eager():
+@funsor.function(reals(8), (reals(), bint(8)))
+def max_and_argmax(x):
+    return tuple(_numeric_max_and_argmax(x))
 
-    @funsor.function(reals(8), (reals(), bint(8)))
-    def max_and_argmax(x):
-        return tuple(_numeric_max_and_argmax(x))
 
+def test_function_nested_eager():
     inputs = OrderedDict([('i', bint(2)), ('j', bint(3))])
     x = Tensor(randn((2, 3, 8)), inputs)
     m, a = _numeric_max_and_argmax(x.data)
@@ -702,11 +737,6 @@ def test_function_nested_eager():
 
 
 def test_function_nested_lazy():
-
-    @funsor.function(reals(8), (reals(), bint(8)))
-    def max_and_argmax(x):
-        return tuple(_numeric_max_and_argmax(x))
-
     x_lazy = Variable('x', reals(8))
     lazy_max, lazy_argmax = max_and_argmax(x_lazy)
     assert isinstance(lazy_max, funsor.tensor.Function)
@@ -752,10 +782,8 @@ def test_align():
     y = x.align(('j', 'k', 'i'))
     assert isinstance(y, Tensor)
     assert tuple(y.inputs) == ('j', 'k', 'i')
-    for i in range(2):
-        for j in range(3):
-            for k in range(4):
-                assert x(i=i, j=j, k=k) == y(i=i, j=j, k=k)
+    assert_close(y.data, ops.permute(x.data, (1, 2, 0)))
+    assert x(i=1, j=2, k=3) == y(i=1, j=2, k=3)
 
 
 EINSUM_EXAMPLES = [
@@ -775,7 +803,10 @@ EINSUM_EXAMPLES = [
 ]
 
 
-@pytest.mark.parametrize('equation', EINSUM_EXAMPLES)
+@pytest.mark.parametrize('equation', EINSUM_EXAMPLES + [
+    'a,ab,bc->ac',
+    'ab,bc,ca->',
+])
 def test_einsum(equation):
     sizes = dict(a=2, b=3, c=4)
     inputs, outputs = equation.split('->')
@@ -122,6 +122,23 @@ def test_reinterpret(expr):
     assert funsor.reinterpret(x) is x
 
 
+def test_reinterpret_shared_subexpression():
+    with interpretation(reflect):
+        x = Variable('x', reals())
+        y = x * 2
+        z = y + y * y
+
+    calls = []
+
+    def counting(cls, *args):
+        calls.append(cls)
+        return reflect(cls, *args)
+
+    with interpretation(counting):
+        assert reinterpret(z) is z
+    assert sum(issubclass(cls, Binary) for cls in calls) == 3
+
+
 @pytest.mark.parametrize("expr", [
     "Variable('x', reals())",
     "Number(1)",
@@ -181,6 +198,16 @@ def test_substitute():
     assert f(x=y, y=z, z=x) is y * z + y * x
 
 
+@pytest.mark.parametrize('interp', [eager, lazy, normalize, reflect])
+def test_call_without_subs(interp):
+    x = Variable('x', reals())
+    y = Variable('y', reals())
+    with interpretation(interp):
+        f = x * y
+        assert f() is f
+        assert f(z=1.) is f
+
+
 def unary_eval(symbol, x):
     if symbol in ['~', '-']:
         return eval('{} x'.format(symbol))